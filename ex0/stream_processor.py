@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict
+from typing import Any, ClassVar, List, Dict, Optional
+import re
 import sys
 
 
@@ -12,9 +13,13 @@ class DataProcessor(ABC):
         pass
 
     @abstractmethod
+    def try_process(self, data: Any) -> Optional[str]:
+        """Validate and process the data at once, None if it is invalid."""
+        pass
+
     def validate(self, data: Any) -> bool:
         """Validate whether this data is of the required type."""
-        pass
+        return self.try_process(data) is not None
 
     def format_output(self, result: str) -> str:
         """Format the processed data."""
@@ -24,32 +29,45 @@ class DataProcessor(ABC):
 class NumericProcessor(DataProcessor):
     """Processor for numeric data."""
 
+    def __init__(self) -> None:
+        """Initialize NumericProcessor with an empty cache."""
+        self._last_result: Optional[str] = None
+        self._last_data: List[int] = []
+
     def process(self, data: Any) -> str:
         """Process the data into str."""
-        if type(data) is not list:
-            print("[Error]: expected a list", file=sys.stderr)
-            return ""
-        for i in data:
-            if type(i) is not int:
+        result: Optional[str] = self.try_process(data)
+        if result is None:
+            if type(data) is not list:
+                print("[Error]: expected a list", file=sys.stderr)
+            else:
                 print("[Error]: expected list of ints", file=sys.stderr)
-                return ""
-        return " ".join(map(str, data))
+            return ""
+        return result
+
+    def try_process(self, data: Any) -> Optional[str]:
+        """Validate and process the data at once, None if it is invalid."""
+        if not self.validate(data):
+            return None
+        result: str = " ".join(map("{:d}".format, data))
+        self._last_result = result
+        self._last_data = data
+        return result
 
     def validate(self, data: Any) -> bool:
         """Validate whether this data is of the required type."""
-        if type(data) is not list:
-            return False
-        for i in data:
-            if type(i) is not int:
-                return False
-        return True
+        return type(data) is list and all(map(int.__instancecheck__, data))
 
     def format_output(self, result: str) -> str:
         """Format the processed data."""
         if not isinstance(result, str):
             print("[Error]: result should be a string", file=sys.stderr)
             return ""
-        data: List[int] = [int(num) for num in result.split()]
+        data: List[int]
+        if result is self._last_result:
+            data = self._last_data
+        else:
+            data = [int(num) for num in result.split()]
         summary: int = sum(data)
         avg = summary / len(data)
         return (
@@ -63,15 +81,15 @@ class TextProcessor(DataProcessor):
 
     def process(self, data: Any) -> str:
         """Process the data into str."""
-        if type(data) is not str:
+        result: Optional[str] = self.try_process(data)
+        if result is None:
             print("[Error]: expected text data", file=sys.stderr)
             return ""
-        else:
-            return data
+        return result
 
-    def validate(self, data: Any) -> bool:
-        """Validate whether this data is of the required type."""
-        return type(data) is str
+    def try_process(self, data: Any) -> Optional[str]:
+        """Validate and process the data at once, None if it is invalid."""
+        return data if type(data) is str else None
 
     def format_output(self, result: str) -> str:
         """Return a formatted string."""
@@ -88,33 +106,37 @@ class LogProcessor(DataProcessor):
     """Processor for log data."""
 
     level: tuple[str, str, str, str] = ("ERROR:", "WARN:", "INFO:", "DEBUG:")
+    _LEVEL_RE: ClassVar[re.Pattern[str]] = re.compile(
+        "|".join(map(re.escape, level))
+    )
+    _LABEL: ClassVar[Dict[str, str]] = {
+        "ERROR": "[ALERT]",
+        "WARN": "[ALERT]",
+        "DEBUG": "[INFO]",
+        "INFO": "[INFO]",
+    }
 
     def process(self, data: Any) -> str:
         """Process the data into str."""
-        if type(data) is not str or not data.startswith(self.level):
+        result: Optional[str] = self.try_process(data)
+        if result is None:
             print("[Error]: expected log data", file=sys.stderr)
             return ""
-        else:
-            return data
+        return result
 
-    def validate(self, data: Any) -> bool:
-        """Validate whether this data is of the required type."""
-        return type(data) is str and data.startswith(self.level)
+    def try_process(self, data: Any) -> Optional[str]:
+        """Validate and process the data at once, None if it is invalid."""
+        if type(data) is not str or not self._LEVEL_RE.match(data):
+            return None
+        return data
 
     def format_output(self, result: str) -> str:
         """Format the processed data."""
-        label: Dict[str, str] = {
-            "ERROR": "[ALERT]",
-            "WARN": "[ALERT]",
-            "DEBUG": "[INFO]",
-            "INFO": "[INFO]",
-        }
-        split = result.split(": ")
-        if len(split) != 2:
+        level, sep, message = result.partition(": ")
+        if not sep:
             print("[Error]: wrong format", file=sys.stderr)
             return ""
-        (level, message) = split
-        return f"{label[level]} {level} level detected: {message}"
+        return f"{self._LABEL[level]} {level} level detected: {message}"
 
 
 def test_numeric_processor() -> None:
@@ -187,13 +209,11 @@ def test_polymorphic_processing() -> None:
 
     def get_processing_result(processor: DataProcessor, data: Any) -> str:
         """Use the processor given on the data and return the output."""
-        valid: bool = processor.validate(data)
-        if not valid:
+        processed: Optional[str] = processor.try_process(data)
+        if processed is None:
             print("Error: Invalid data for the processor")
             return ""
-        processed: str = processor.process(data)
-        result = processor.format_output(processed)
-        return result
+        return processor.format_output(processed)
 
     i = 1
     for processor, data in data_processor_pairs:
@@ -1,211 +1,300 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict, Union, Optional, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from array import array
+from collections import Counter
+from itertools import compress
+from operator import and_, itemgetter
 import sys
 
 
+def _is_str_batch(data_batch: Any) -> bool:
+    """Check whether data_batch is a list of strings."""
+    return isinstance(data_batch, list) and all(
+        isinstance(i, str) for i in data_batch
+    )
+
+
+class ParsedBatch(NamedTuple):
+    """Batch of strings split once into parallel columns."""
+
+    entries: List[str]
+    keys: List[str]
+    values: List[str]
+    pair_entries: List[str]
+    bare: List[str]
+
+
+def _split_batch(data_batch: List[str]) -> ParsedBatch:
+    """Split a validated batch into key:value columns and bare entries."""
+    split: List[List[str]] = [entry.split(":") for entry in data_batch]
+    is_pair: List[bool] = [len(pair) == 2 for pair in split]
+    pairs: List[List[str]] = list(compress(split, is_pair))
+    return ParsedBatch(
+        data_batch,
+        list(map(itemgetter(0), pairs)),
+        list(map(itemgetter(1), pairs)),
+        list(compress(data_batch, is_pair)),
+        [pair[0] for pair in split if len(pair) == 1],
+    )
+
+
+def _select_kv(
+    parsed: ParsedBatch,
+    possible_fields: FrozenSet[str],
+    cast: Callable[[str], Any],
+) -> Tuple[List[str], List[Any], List[str]]:
+    """Select key:value entries of possible fields and cast their values."""
+    kept: List[bool] = list(map(possible_fields.__contains__, parsed.keys))
+    return (
+        list(compress(parsed.keys, kept)),
+        list(map(cast, compress(parsed.values, kept))),
+        list(compress(parsed.pair_entries, kept)),
+    )
+
+
+def _parse_threshold(
+    criteria: str, cast: Callable[[str], Any]
+) -> Tuple[str, Any]:
+    """Split field:threshold criteria and cast its threshold."""
+    c_field, c_threshold = criteria.split(":", 1)
+    return c_field, cast(c_threshold)
+
+
+def _threshold_mask(
+    keys: List[str], values: List[Any], field: str, threshold: Any
+) -> Iterator[bool]:
+    """Mark the entries of field whose value is above threshold."""
+    return map(and_, map(field.__eq__, keys), map(threshold.__lt__, values))
+
+
 class DataStream(ABC):
     """Abstract class of all streams."""
 
     type: str
     unit: str
     data_type: str
-    possible_fields: Set[str]
+    possible_fields: FrozenSet[str]
+    kind: Optional[int] = None
 
     def __init__(self, id: str) -> None:
         """Initialize DataStream with id."""
         self.id = id
         self.data: Dict[Any, Any] = {}
 
-    @abstractmethod
     def process_batch(self, data_batch: List[Any]) -> str:
-        """Abstact method to process data with this stream."""
+        """Process data with this stream."""
+        if not _is_str_batch(data_batch):
+            return "[Error]: the given data batch is not a list of strings."
+        return self._process_parsed(_split_batch(data_batch))
+
+    @abstractmethod
+    def _process_parsed(self, parsed: ParsedBatch) -> str:
+        """Abstract method to process an already split batch."""
         pass
 
     def filter_data(
         self, data_batch: List[Any], criteria: Optional[str] = None
     ) -> List[Any]:
         """Filter data using specific criteria."""
-        if criteria is None:
+        if criteria is None or not _is_str_batch(data_batch):
             return data_batch
-        if not isinstance(data_batch, list) or any(
-            (not isinstance(i, str) for i in data_batch)
-        ):
-            return data_batch
-        new_data = []
-        for entry in data_batch.copy():
-            if entry == criteria:
-                new_data.append(entry)
-        return new_data
+        return self._filter_parsed(_split_batch(data_batch), criteria)
+
+    def _filter_parsed(self, parsed: ParsedBatch, criteria: str) -> List[str]:
+        """Filter an already split batch using specific criteria."""
+        return [entry for entry in parsed.entries if entry == criteria]
+
+    def count_matches(
+        self, data_batch: List[Any], criteria: Optional[str] = None
+    ) -> int:
+        """Count the entries filter_data would keep, without a new list."""
+        if criteria is None or not _is_str_batch(data_batch):
+            return len(data_batch)
+        return self._count_parsed(_split_batch(data_batch), criteria)
+
+    def _count_parsed(self, parsed: ParsedBatch, criteria: str) -> int:
+        """Count matching entries of an already split batch."""
+        return self._compile_counter(criteria)(parsed)
+
+    def _compile_counter(self, criteria: str) -> Callable[[ParsedBatch], int]:
+        """Build a counter of matching entries with criteria parsed once."""
+        return lambda parsed: parsed.entries.count(criteria)
 
     def get_stats(self) -> Dict[str, Union[str, int, float]]:
         """Get stats about the current stream."""
         return {"amount": len(self.data)}
 
 
-class SensorStream(DataStream):
+class NumericStream(DataStream):
+    """DataStream of key:value entries with numeric values."""
+
+    _cast: ClassVar[Callable[[str], Any]]
+
+    def _filter_parsed(self, parsed: ParsedBatch, criteria: str) -> List[str]:
+        """Filter data using specific criteria."""
+        try:
+            c_field, threshold = _parse_threshold(criteria, type(self)._cast)
+            keys, values, entries = _select_kv(
+                parsed, self.possible_fields, type(self)._cast
+            )
+        except ValueError:
+            return parsed.entries
+        mask: Iterator[bool] = _threshold_mask(
+            keys, values, c_field, threshold
+        )
+        return list(compress(entries, mask))
+
+    def _compile_counter(self, criteria: str) -> Callable[[ParsedBatch], int]:
+        """Build a counter of matching entries with criteria parsed once."""
+        cast: Callable[[str], Any] = type(self)._cast
+        try:
+            c_field, threshold = _parse_threshold(criteria, cast)
+        except ValueError:
+            return lambda parsed: len(parsed.entries)
+        possible_fields: FrozenSet[str] = self.possible_fields
+
+        def count(parsed: ParsedBatch) -> int:
+            try:
+                keys, values, _ = _select_kv(parsed, possible_fields, cast)
+            except ValueError:
+                return len(parsed.entries)
+            return sum(_threshold_mask(keys, values, c_field, threshold))
+
+        return count
+
+
+class SensorStream(NumericStream):
     """DataStream for processing and filtering sensor data."""
 
     type: str = "Environmental Data"
     unit: str = "reading"
     data_type: str = "Sensor data"
-    possible_fields: Set[str] = {
+    kind: Optional[int] = 0
+    _cast: ClassVar[Callable[[str], Any]] = float
+    possible_fields: FrozenSet[str] = frozenset({
         "temp",
         "humidity",
         "pressure",
-    }
+    })
 
     def __init__(self, id: str) -> None:
         """Initialize SensorStream with id."""
         super().__init__(id)
-        self.data: Dict[str, List[float]] = {}
+        self.data: Dict[str, "array[float]"] = {}
+        self._total_count: int = 0
+        self._temp_sum: float = 0.0
+        self._temp_n: int = 0
 
-    def process_batch(self, data_batch: List[Any]) -> str:
+    def _process_parsed(self, parsed: ParsedBatch) -> str:
         """Process sensor data batch."""
-        batch_str: str = str(data_batch).replace("'", "")
-
-        if not isinstance(data_batch, list) or any(
-            (not isinstance(i, str) for i in data_batch)
-        ):
-            return "[Error]: the given data batch is not a list of strings."
-
-        data_batch = [s.split(":") for s in data_batch]
-        data_batch = [i for i in data_batch if len(i) == 2]
+        batch_str: str = "[" + ", ".join(parsed.entries) + "]"
 
+        keys: List[str]
+        values: List[float]
         try:
-            for key, val in data_batch:
-                if key not in self.possible_fields:
-                    continue
-                val = float(val)
-                if key in self.data:
-                    self.data[key].append(val)
-                else:
-                    self.data[key] = [val]
+            keys, values, _ = _select_kv(
+                parsed, self.possible_fields, type(self)._cast
+            )
         except ValueError:
             return "[Error]: the values should be numbers"
 
+        data: Dict[str, "array[float]"] = self.data
+        temp_sum: float = self._temp_sum
+        temp_n: int = self._temp_n
+        for key, val in zip(keys, values):
+            if key in data:
+                data[key].append(val)
+            else:
+                data[key] = array("d", (val,))
+            if key == "temp":
+                temp_sum += val
+                temp_n += 1
+        self._temp_sum = temp_sum
+        self._temp_n = temp_n
+        self._total_count += len(values)
+
         return f"Processing sensor batch: {batch_str}"
 
     def get_stats(self) -> Dict[str, Union[str, int, float]]:
         """Get stats about the processed data."""
-        temps = self.data.get("temp", [0])
         return {
-            "amount": sum((len(i) for i in self.data.values())),
-            "avg": sum(temps) / len(temps),
+            "amount": self._total_count,
+            "avg": self._temp_sum / self._temp_n if self._temp_n else 0.0,
         }
 
-    def filter_data(
-        self, data_batch: List[Any], criteria: Optional[str] = None
-    ) -> List[Any]:
-        """Filter data using specific criteria."""
-        if (
-            criteria is None
-            or not isinstance(data_batch, list)
-            or any((not isinstance(i, str) for i in data_batch))
-        ):
-            return data_batch
-
-        split: List[List[str]] = [i.split(":") for i in data_batch]
-        c_field, c_threshold = criteria.split(":", 1)
 
-        try:
-            c_threshold = float(c_threshold)
-            new_data: List[Any] = []
-            for entry, i in zip(split, data_batch, strict=False):
-                if len(entry) != 2:
-                    continue
-                key, val = entry
-                if key not in self.possible_fields:
-                    continue
-                val = float(val)
-                if key == c_field and val > c_threshold:
-                    new_data.append(i)
-            return new_data
-        except ValueError:
-            return data_batch
-
-
-class TransactionStream(DataStream):
+class TransactionStream(NumericStream):
     """DataStream for processing and filtering transaction data."""
 
     type: str = "Financial Data"
     unit: str = "operation"
     data_type: str = "Transaction data"
-    possible_fields: Set[str] = {
+    kind: Optional[int] = 1
+    _cast: ClassVar[Callable[[str], Any]] = int
+    possible_fields: FrozenSet[str] = frozenset({
         "buy",
         "sell",
-    }
+    })
     critical_limit: int = 100
 
     def __init__(self, id: str) -> None:
         """Initialize TransactionStream with id."""
         super().__init__(id)
         self.data: Dict[str, List[int]] = {}
+        self._total_count: int = 0
+        self._buy_sum: int = 0
+        self._sell_sum: int = 0
 
-    def process_batch(self, data_batch: List[Any]) -> str:
+    def _process_parsed(self, parsed: ParsedBatch) -> str:
         """Process transaction data batch."""
-        batch_str: str = str(data_batch).replace("'", "")
-
-        if not isinstance(data_batch, list) or any(
-            (not isinstance(i, str) for i in data_batch)
-        ):
-            return "[Error]: the given data batch is not a list of strings."
-
-        data_batch = [s.split(":") for s in data_batch]
-        data_batch = [i for i in data_batch if len(i) == 2]
+        batch_str: str = "[" + ", ".join(parsed.entries) + "]"
 
+        keys: List[str]
+        values: List[int]
         try:
-            for key, val in data_batch:
-                if key not in self.possible_fields:
-                    continue
-                val = int(val)
-                if key in self.data:
-                    self.data[key].append(val)
-                else:
-                    self.data[key] = [val]
+            keys, values, _ = _select_kv(
+                parsed, self.possible_fields, type(self)._cast
+            )
         except ValueError:
             return "[Error]: the values should be integers"
 
+        data: Dict[str, List[int]] = self.data
+        buy_sum: int = self._buy_sum
+        sell_sum: int = self._sell_sum
+        for key, val in zip(keys, values):
+            if key in data:
+                data[key].append(val)
+            else:
+                data[key] = [val]
+            if key == "buy":
+                buy_sum += val
+            else:
+                sell_sum += val
+        self._buy_sum = buy_sum
+        self._sell_sum = sell_sum
+        self._total_count += len(values)
+
         return f"Processing transaction batch: {batch_str}"
 
     def get_stats(self) -> Dict[str, Union[str, int, float]]:
         """Get stats about the processed data."""
-        buys = self.data.get("buy", [0])
-        sells = self.data.get("sell", [0])
         return {
-            "amount": sum((len(i) for i in self.data.values())),
-            "flow": sum(buys) - sum(sells),
+            "amount": self._total_count,
+            "flow": self._buy_sum - self._sell_sum,
         }
 
-    def filter_data(
-        self, data_batch: List[Any], criteria: Optional[str] = None
-    ) -> List[Any]:
-        """Filter data using specific criteria."""
-        if (
-            criteria is None
-            or not isinstance(data_batch, list)
-            or any((not isinstance(i, str) for i in data_batch))
-        ):
-            return data_batch
-
-        split: List[List[str]] = [i.split(":") for i in data_batch]
-        c_field, c_threshold = criteria.split(":", 1)
-
-        try:
-            c_threshold = int(c_threshold)
-            new_data: List[Any] = []
-            for entry, i in zip(split, data_batch, strict=False):
-                if len(entry) != 2:
-                    continue
-                key, val = entry
-                if key not in self.possible_fields:
-                    continue
-                val = int(val)
-                if key == c_field and val > c_threshold:
-                    new_data.append(i)
-            return new_data
-        except ValueError:
-            return data_batch
-
 
 class EventStream(DataStream):
     """DataStream for processing and filtering event data."""
@@ -213,42 +302,36 @@ class EventStream(DataStream):
     type: str = "System Events"
     unit: str = "event"
     data_type: str = "Event data"
-    possible_fields: Set[str] = {
+    kind: Optional[int] = 2
+    possible_fields: FrozenSet[str] = frozenset({
         "login",
         "logout",
         "register",
         "error",
-    }
+    })
 
     def __init__(self, id: str) -> None:
         """Initialize EventStream with id."""
         super().__init__(id)
-        self.data: Dict[str, int] = {}
+        self.data: Counter[str] = Counter()
 
-    def process_batch(self, data_batch: List[Any]) -> str:
+    def _process_parsed(self, parsed: ParsedBatch) -> str:
         """Process event data batch."""
-        batch_str: str = str(data_batch).replace("'", "")
-
-        if not isinstance(data_batch, list) or any(
-            (not isinstance(i, str) for i in data_batch)
-        ):
-            return "[Error]: the given data batch is not a list of strings."
+        batch_str: str = "[" + ", ".join(parsed.entries) + "]"
 
-        data_batch = [i for i in data_batch if ":" not in i]
-        for key in data_batch:
-            if key not in self.possible_fields:
-                continue
-            if key in self.data:
-                self.data[key] += 1
-            else:
-                self.data[key] = 1
+        self.data.update(
+            compress(
+                parsed.bare,
+                map(self.possible_fields.__contains__, parsed.bare),
+            )
+        )
 
         return f"Processing event batch: {batch_str}"
 
     def get_stats(self) -> Dict[str, Union[str, int, float]]:
         """Get stats about the processed data."""
         return {
-            "amount": sum((i for i in self.data.values())),
+            "amount": self.data.total(),
             "errors": self.data.get("error", 0),
         }
 
@@ -264,8 +347,17 @@ class StreamProcessor:
 
     def __init__(self) -> None:
         """Initialize StreamProcessor."""
-        self.data_streams: List[Tuple[DataStream, Optional[str]]] = []
+        self.data_streams: List[
+            Tuple[DataStream, Callable[[ParsedBatch], int]]
+        ] = []
         self.batches_processed: int = 0
+        self._out_buf: List[str] = []
+
+    def flush(self) -> None:
+        """Write all the buffered output lines at once."""
+        if self._out_buf:
+            sys.stdout.write("\n".join(self._out_buf) + "\n")
+            self._out_buf.clear()
 
     def add_stream(self, stream: DataStream, filter_criteria: Optional[str]):
         """Add a new stream to use for processing and filtering."""
@@ -274,35 +366,44 @@ class StreamProcessor:
         ):
             print("[Error]: this is not a valid stream", file=sys.stderr)
             return
-        self.data_streams.append((stream, filter_criteria))
+        self.data_streams.append(
+            (stream, stream._compile_counter(filter_criteria))
+        )
 
     def process(self, data_batch: List[Any]):
         """Process the same batch of data through all the streams."""
         self.batches_processed += 1
+        parsed: Optional[ParsedBatch] = (
+            _split_batch(data_batch) if _is_str_batch(data_batch) else None
+        )
         for stream, _ in self.data_streams:
-            stream.process_batch(data_batch)
+            if parsed is not None:
+                stream._process_parsed(parsed)
             stats = stream.get_stats()
-            print(
+            self._out_buf.append(
                 f"- {stream.data_type}: "
                 f"{stats['amount']} {stream.unit}s processed"
             )
+        self.flush()
 
     def filter(self, data_batch: List[Any]):
         """Filter this data batch through all the stream."""
-        critical_sensor: int = 0
-        critical_transaction: int = 0
-        critical_event: int = 0
-
-        for stream, criteria in self.data_streams:
-            filtered: List[Any] = stream.filter_data(data_batch, criteria)
-            if isinstance(stream, SensorStream):
-                critical_sensor += len(filtered)
-            if isinstance(stream, TransactionStream):
-                critical_transaction += len(filtered)
-            if isinstance(stream, EventStream):
-                critical_event += len(filtered)
-
-        print("Filtered results: ", end="")
+        critical: List[int] = [0, 0, 0]
+
+        parsed: Optional[ParsedBatch] = (
+            _split_batch(data_batch) if _is_str_batch(data_batch) else None
+        )
+        for stream, count_matches in self.data_streams:
+            matches: int = (
+                count_matches(parsed)
+                if parsed is not None
+                else len(data_batch)
+            )
+            if stream.kind is not None:
+                critical[stream.kind] += matches
+
+        critical_sensor, critical_transaction, critical_event = critical
+
         reports: List[str] = []
         if critical_sensor > 0:
             reports.append(f"{critical_sensor} critical sensor alerts")
@@ -310,7 +411,8 @@ class StreamProcessor:
             reports.append(f"{critical_transaction} large transaction")
         if critical_event > 0:
             reports.append(f"{critical_event} spoopy event D:")
-        print(", ".join(reports))
+        self._out_buf.append("Filtered results: " + ", ".join(reports))
+        self.flush()
 
 
 def test_sensor_stream() -> None:
@@ -1,8 +1,41 @@
-import csv
 import json
-import sys
+import logging
+import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Protocol, Union
+from csv import reader as _csv_reader
+from io import StringIO
+from typing import (
+    Any, Callable, ClassVar, Dict, List, Protocol, Tuple, Union
+)
+
+_log_error: Callable[..., None] = logging.getLogger(__name__).error
+_STAGE_ERROR: str = "Error detected in Stage %d: %s"
+
+_LONG_DIGITS: "re.Pattern[str]" = re.compile(r"\d{19}")
+_LONG_DIGITS_BYTES: "re.Pattern[bytes]" = re.compile(rb"\d{19}")
+
+
+def _orjson_loads(raw: Union[str, bytes]) -> Any:
+    """Parse json with orjson, or json for wide ints, NaN and Infinity."""
+    has_long_int: bool = (
+        _LONG_DIGITS.search(raw) if isinstance(raw, str)
+        else _LONG_DIGITS_BYTES.search(raw)
+    ) is not None
+    if not has_long_int:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+_json_loads: Callable[[Union[str, bytes]], Any]
+try:
+    import orjson
+
+    _json_loads = _orjson_loads
+except ImportError:
+    _json_loads = json.loads
 
 
 class ProcessingStage(Protocol):
@@ -13,87 +46,168 @@ class ProcessingStage(Protocol):
         pass
 
 
+class StageError:
+    """Error returned by a stage to stop the rest of the pipeline."""
+
+    __slots__ = ("message",)
+
+    def __init__(self, message: str) -> None:
+        """Initialize a new StageError with its message."""
+        self.message = message
+
+
 class ProcessingPipeline(ABC):
     """Super class for all pipelines."""
 
+    __slots__ = ("stages",)
+
     def __init__(self) -> None:
         """Initialize a new pipeline."""
-        self.stages: List[ProcessingStage] = []
+        self.stages: Union[
+            List[ProcessingStage], Tuple[ProcessingStage, ...]
+        ] = []
 
     def add_stage(self, stage: ProcessingStage) -> None:
         """Add this object to stage if it has a 'process' (ducktyping)."""
-        if callable(getattr(stage, "process", None)):
-            self.stages.append(stage)
+        if not callable(getattr(stage, "process", None)):
+            return
+        if isinstance(self.stages, tuple):
+            self.stages = list(self.stages)
+        self.stages.append(stage)
+
+    def freeze(self) -> None:
+        """Store the stages as a tuple once they have all been added."""
+        self.stages = tuple(self.stages)
 
     @abstractmethod
     def process(self, data: Any) -> Any:
         """Abstract method to process data through pipeline stages."""
         pass
 
+    def _run_stages(self, data: Any) -> Any:
+        """Run data through every stage, stopping at the first error."""
+        for stage in self.stages:
+            data = stage.process(data)
+            if data.__class__ is StageError:
+                return {"error": data.message}
+        return data
+
+    def process_batch(self, records: List[Any]) -> List[Any]:
+        """Process many records through pipeline stages."""
+        process = self.process
+        return [process(record) for record in records]
+
 
 class InputStage:
     """Input stage processor class."""
 
-    def process(self, data: Any) -> Dict:
+    __slots__ = ()
+
+    def process(self, data: Any) -> Union[Dict, StageError]:
         """Process data."""
         try:
             data["valid"] = True
         except Exception:
-            print(
-                "Error detected in Stage 2: Invalid data format",
-                file=sys.stderr,
-            )
-            data = {"error": "error in stage 1"}
+            _log_error(_STAGE_ERROR, 1, "Invalid data format")
+            data = StageError("error in stage 1")
         return data
 
 
+def _parse_json(data: Dict, raw: Any) -> None:
+    """Parse the raw json text, unless it is already a dict."""
+    if not isinstance(raw, dict):
+        data["parsed"] = _json_loads(raw)
+
+
+def _parse_csv(data: Dict, raw: Any) -> None:
+    """Parse the raw csv text into a list of rows."""
+    if type(raw) is str:
+        if (
+            _FAST_CSV
+            and raw
+            and '"' not in raw
+            and "\n" not in raw
+            and "\r" not in raw
+        ):
+            data["parsed"] = [raw.split(",")]
+            return
+        raw = StringIO(raw, newline="")
+    data["parsed"] = list(_csv_reader(raw))
+
+
+def _parse_stream(data: Dict, raw: Any) -> None:
+    """Pass the raw stream through as is."""
+    data["parsed"] = raw
+
+
+_FAST_CSV: bool = True
+_PARSERS: Dict[str, Callable[[Dict, Any], None]] = {
+    "json": _parse_json,
+    "csv": _parse_csv,
+    "stream": _parse_stream,
+}
+
+
+def _transform(data: Any) -> Any:
+    """Parse the record's raw data in place and return it, or a StageError."""
+    try:
+        parse = _PARSERS.get(data["type"])
+        raw = data["raw"]
+        if parse is None:
+            raise ValueError()
+        parse(data, raw)
+    except Exception:
+        _log_error(_STAGE_ERROR, 2, "Invalid data format")
+        return StageError("error in stage 2")
+    return raw
+
+
 class TransformStage:
     """Transform stage processor class."""
 
-    def process(self, data: Any) -> Dict:
-        """Process data."""
-        try:
-            data_type = data["type"]
-            raw = data["raw"]
-
-            match data_type:
-                case "json":
-                    if not isinstance(raw, dict):
-                        data["parsed"] = json.loads(raw)
-                case "csv":
-                    data["parsed"] = csv.reader(raw)
-                case "stream":
-                    data["parsed"] = raw
-                case _:
-                    raise ValueError()
-        except Exception:
-            print(
-                "Error detected in Stage 2: Invalid data format",
-                file=sys.stderr,
-            )
-            data = {"error": "error in stage 2"}
+    __slots__ = ()
 
-        return data
+    def process(self, data: Any) -> Union[Dict, StageError]:
+        """Process data."""
+        raw = _transform(data)
+        return raw if raw.__class__ is StageError else data
 
 
 class OutputStage:
     """Output stage processor class."""
 
+    __slots__ = ()
+
     def process(self, data: Any) -> str:
         """Process data."""
         try:
             return data["raw"]
         except Exception:
-            print(
-                "Error detected in Stage 3: Invalid data format",
-                file=sys.stderr,
-            )
+            _log_error(_STAGE_ERROR, 3, "Invalid data format")
             return ""
 
 
+class FusedStage:
+    """Input, transform and output stages fused into a single stage."""
+
+    __slots__ = ()
+
+    def process(self, data: Any) -> Union[str, StageError]:
+        """Process data."""
+        try:
+            data["valid"] = True
+        except Exception:
+            _log_error(_STAGE_ERROR, 1, "Invalid data format")
+            return StageError("error in stage 1")
+        return _transform(data)
+
+
 class JSONAdapter(ProcessingPipeline):
     """JSON data pipeline."""
 
+    __slots__ = ("pipeline_id",)
+    _TYPE: ClassVar[str] = "json"
+
     def __init__(self, pipeline_id: str) -> None:
         """Initialize a new pipeline."""
         super().__init__()
@@ -101,20 +215,15 @@ class JSONAdapter(ProcessingPipeline):
 
     def process(self, data: Any) -> Union[str, Any]:
         """Process data through pipeline stages."""
-        data = {
-            "raw": data,
-            "type": "json",
-        }
-        for stage in self.stages:
-            data = stage.process(data)
-            if isinstance(data, dict) and "error" in data:
-                break
-        return data
+        return self._run_stages({"raw": data, "type": self._TYPE})
 
 
 class CSVAdapter(ProcessingPipeline):
     """JSON data pipeline."""
 
+    __slots__ = ("pipeline_id",)
+    _TYPE: ClassVar[str] = "csv"
+
     def __init__(self, pipeline_id: str) -> None:
         """Initialize a new pipeline."""
         super().__init__()
@@ -122,20 +231,15 @@ class CSVAdapter(ProcessingPipeline):
 
     def process(self, data: Any) -> Union[str, Any]:
         """Process data through pipeline stages."""
-        data = {
-            "raw": data,
-            "type": "csv",
-        }
-        for stage in self.stages:
-            data = stage.process(data)
-            if isinstance(data, dict) and "error" in data:
-                break
-        return data
+        return self._run_stages({"raw": data, "type": self._TYPE})
 
 
 class StreamAdapter(ProcessingPipeline):
     """JSON data pipeline."""
 
+    __slots__ = ("pipeline_id",)
+    _TYPE: ClassVar[str] = "stream"
+
     def __init__(self, pipeline_id: str) -> None:
         """Initialize a new pipeline."""
         super().__init__()
@@ -143,20 +247,14 @@ class StreamAdapter(ProcessingPipeline):
 
     def process(self, data: Any) -> Union[str, Any]:
         """Process data through pipeline stages."""
-        data = {
-            "raw": data,
-            "type": "stream",
-        }
-        for stage in self.stages:
-            data = stage.process(data)
-            if isinstance(data, dict) and "error" in data:
-                break
-        return data
+        return self._run_stages({"raw": data, "type": self._TYPE})
 
 
 class NexusManager:
     """Orchestrates multiple pipeline chains."""
 
+    __slots__ = ("pipelines",)
+
     def __init__(self) -> None:
         """Initialize a new NexusManager."""
         self.pipelines: List[ProcessingPipeline] = []
@@ -172,18 +270,39 @@ class NexusManager:
             for pipeline in self.pipelines:
                 data = pipeline.process(data)
         except Exception:
-            print(
-                "Error detected while processing through many pipelines",
-                file=sys.stderr,
+            _log_error(
+                "Error detected while processing through many pipelines"
+            )
+
+    def process_batch(self, records: List[Any]) -> List[Any]:
+        """Process records through the chain, or return [] on failure."""
+        try:
+            for pipeline in self.pipelines:
+                records = pipeline.process_batch(records)
+        except Exception:
+            _log_error(
+                "Error detected while processing through many pipelines"
             )
+            return []
+        return records
+
+
+_DEFAULT_STAGES: Tuple[ProcessingStage, ...] = (
+    InputStage(),
+    TransformStage(),
+    OutputStage(),
+)
+_FUSED_STAGES: Tuple[ProcessingStage, ...] = (FusedStage(),)
 
 
-def add_processing_stages(pipeline: ProcessingPipeline) -> None:
-    """Add 3 stage stages to the given pipeline (input, transform, output)."""
+def add_processing_stages(
+    pipeline: ProcessingPipeline, fused: bool = True
+) -> None:
+    """Add input, transform and output stages, fused into one by default."""
     try:
-        pipeline.add_stage(InputStage())
-        pipeline.add_stage(TransformStage())
-        pipeline.add_stage(OutputStage())
+        for stage in _FUSED_STAGES if fused else _DEFAULT_STAGES:
+            pipeline.add_stage(stage)
+        pipeline.freeze()
     except Exception:
         print("Error detected while adding stages: not a valid pipeline")
 